@@ -5,23 +5,30 @@ code handler, diffing, recap formatter, and memory handler.
 
 from __future__ import annotations
 
-import json
+import copy
+import hashlib
 import logging
 import os
-import traceback
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import boto3
+import orjson
+from botocore.config import Config
 from dotenv import load_dotenv
-from flask import Flask, Response, jsonify, request
+from flask import Flask, Response, request
 from flask_cors import CORS
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 # ✅ Richer root-level modules
 from code_handler import validate_snippet
 from diffcheck import diff_code_blocks
-from backend.filters import enforce_size_limit, contains_deny_terms, scrub_pii
+from backend.filters import enforce_size_limit_bytes, filter_pipeline
 from backend.recap_formatter import format_recap
 from backend.memory_handler import store_recap
 from backend.schema import Recap
@@ -30,23 +37,55 @@ from lambda_classifier import validate_input_length
 # Load environment variables
 load_dotenv()
 
-# Flask app setup
-app = Flask(__name__)
-CORS(app)
-
 logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"))
 logger = logging.getLogger(__name__)
 
-# AWS Bedrock client
+# AWS Bedrock client (one per process; pooled keep-alive connections)
+BEDROCK_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 2, "mode": "adaptive"},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=60,
+)
+
 try:
     bedrock = boto3.client(
-        "bedrock-runtime", region_name=os.environ.get("AWS_REGION", "us-east-1")
+        "bedrock-runtime",
+        region_name=os.environ.get("AWS_REGION", "us-east-1"),
+        config=BEDROCK_CLIENT_CONFIG,
     )
 except Exception as e:
     logger.warning("Bedrock client could not be initialized: %s", e)
     bedrock = None
 
 
+def _warm_bedrock_client() -> None:
+    """
+    Prime the endpoint resolver and open a pooled TLS connection with a cheap
+    read-only call, so the first recap after deploy skips the cold handshake.
+    The outcome does not matter (an AccessDenied still warms the connection).
+    """
+    if bedrock is None:
+        return
+    try:
+        bedrock.list_async_invokes(maxResults=1)
+    except Exception as e:
+        logger.debug("Bedrock warmup call finished with: %s", e)
+
+
+# Off by default so imports (tests, tooling) stay offline; `make serve` opts in
+if os.environ.get("BEDROCK_WARMUP", "0") == "1":
+    threading.Thread(
+        target=_warm_bedrock_client, name="bedrock-warmup", daemon=True
+    ).start()
+
+# Cap in-flight Bedrock calls so request threads queue here instead of
+# tripping Bedrock throttling under bursts
+BEDROCK_MAX_CONCURRENCY = int(os.environ.get("BEDROCK_MAX_CONCURRENCY", "8"))
+_BEDROCK_SLOTS = threading.BoundedSemaphore(BEDROCK_MAX_CONCURRENCY)
+
+
 # Constants
 class ContentType:
     JSON = "application/json"
@@ -65,11 +104,21 @@ class RecapRequest(BaseModel):
     session_id: str = "default"  # allow namespacing in memory handler
 
 
+# Built once at import so each request reuses the compiled validators
+_RECAP_REQUEST_ADAPTER: TypeAdapter[RecapRequest] = TypeAdapter(RecapRequest)
+_RECAP_ADAPTER: TypeAdapter[Recap] = TypeAdapter(Recap)
+
+
 PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
 
 
+@lru_cache(maxsize=1)
 def load_prompts() -> str:
-    """Load system and classifier prompts from the prompts/ directory."""
+    """
+    Load system and classifier prompts from the prompts/ directory.
+    The prompt files are static at runtime, so the joined string is cached
+    after the first successful read.
+    """
     try:
         system_preamble = (PROMPTS_DIR / "system_prompt.md").read_text(encoding="utf-8")
         classifier_instructions = (PROMPTS_DIR / "classifier_prompt.md").read_text(
@@ -77,81 +126,176 @@ def load_prompts() -> str:
         )
         return f"{system_preamble}\n\n{classifier_instructions}"
     except FileNotFoundError as e:
-        logger.critical(f"Prompt file missing: {e}")
+        logger.critical("Prompt file missing: %s", e)
         raise RuntimeError(f"Required prompt file not found: {PROMPTS_DIR}") from e
 
 
+# Client-side cache of Bedrock classifications, keyed by prompt hash (LRU)
+CLASSIFY_CACHE_MAX = 512
+_CLASSIFY_CACHE: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_CLASSIFY_CACHE_LOCK = threading.Lock()
+# Classifications currently running, so identical concurrent prompts share one call
+_INFLIGHT: Dict[str, "Future[List[Dict[str, Any]]]"] = {}
+
+
+def _build_request_body(prompt: str) -> bytes:
+    """Serialize the Bedrock request once; the same bytes are hashed and sent."""
+    return orjson.dumps(
+        {
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 4000,
+            "anthropic_version": "bedrock-2023-05-31",
+        }
+    )
+
+
+def _body_key(request_body: bytes) -> str:
+    """Stable, compact cache key for a serialized request body."""
+    return hashlib.blake2b(request_body, digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[List[Dict[str, Any]]]:
+    with _CLASSIFY_CACHE_LOCK:
+        cached = _CLASSIFY_CACHE.get(key)
+        if cached is None:
+            return None
+        _CLASSIFY_CACHE.move_to_end(key)
+    # Callers attach "validation" to the block dicts, so hand out a copy
+    return copy.deepcopy(cached)
+
+
+def _cache_put(key: str, blocks: List[Dict[str, Any]]) -> None:
+    with _CLASSIFY_CACHE_LOCK:
+        _CLASSIFY_CACHE[key] = copy.deepcopy(blocks)
+        _CLASSIFY_CACHE.move_to_end(key)
+        while len(_CLASSIFY_CACHE) > CLASSIFY_CACHE_MAX:
+            _CLASSIFY_CACHE.popitem(last=False)
+
+
 def classify_with_bedrock(prompt: str) -> List[Dict[str, Any]]:
-    """Call Bedrock Claude model to classify chat log into code/text blocks."""
+    """
+    Call Bedrock Claude model to classify chat log into code/text blocks.
+    Successful classifications are cached by prompt hash, so repeated
+    transcripts skip the Bedrock round trip. Any classifier failure (no client,
+    a failed call, or an unexpected response shape) raises RuntimeError.
+    Concurrent callers with the same prompt wait on the call already in flight.
+    """
     if bedrock is None:
-        logger.warning("Bedrock not initialized; returning raw text block.")
-        return [{"type": "text", "content": prompt}]
+        logger.error("Bedrock not initialized; cannot classify.")
+        raise RuntimeError("Bedrock classification unavailable; please retry.")
+
+    request_body = _build_request_body(prompt)
+    key = _body_key(request_body)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("classify_with_bedrock cache_hit key=%s", key)
+        return cached
+
+    with _CLASSIFY_CACHE_LOCK:
+        pending = _INFLIGHT.get(key)
+        owner = pending is None
+        if pending is None:
+            pending = _INFLIGHT[key] = Future()
+
+    if not owner:
+        logger.info("classify_with_bedrock inflight_hit key=%s", key)
+        return copy.deepcopy(pending.result())
 
+    try:
+        blocks = _invoke_bedrock_classifier(prompt, request_body, key)
+        pending.set_result(copy.deepcopy(blocks))
+        return blocks
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _CLASSIFY_CACHE_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _invoke_bedrock_classifier(
+    prompt: str, request_body: bytes, key: str
+) -> List[Dict[str, Any]]:
+    """Single Bedrock round trip; seeds the classification cache on success."""
     model_id = os.environ.get(
         "BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0"
     )
 
-    body = {
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 4000,
-        "anthropic_version": "bedrock-2023-05-31",
-    }
-
     try:
-        resp = bedrock.invoke_model(
-            modelId=model_id,
-            accept="application/json",
-            contentType="application/json",
-            body=json.dumps(body),
-        )
-        payload: Any = json.loads(resp["body"].read().decode("utf-8"))
+        with _BEDROCK_SLOTS:
+            resp = bedrock.invoke_model(
+                modelId=model_id,
+                accept="application/json",
+                contentType="application/json",
+                body=request_body,
+            )
+            raw_body = resp["body"].read()
+        payload: Any = orjson.loads(raw_body)
 
         if not isinstance(payload, dict) or "content" not in payload:
-            logger.warning("Unexpected Bedrock response format")
-            return [{"type": "text", "content": prompt}]
+            raise ValueError("Unexpected Bedrock response format")
 
         response_text = payload["content"][0].get("text", "")
 
-        # Split into code vs text blocks
+        # Split into code vs text blocks; fences alternate text/code
         blocks: List[Dict[str, Any]] = []
-        parts = response_text.split("```")
-        for i, part in enumerate(parts):
-            if i % 2 == 0:  # text
-                if part.strip():
-                    blocks.append({"type": "text", "content": part.strip()})
-            else:  # code
-                blocks.append({"type": "code", "content": part.strip()})
-
-        return blocks or [{"type": "text", "content": response_text}]
+        is_code = False
+        for part in response_text.split("```"):
+            content = part.strip()
+            if is_code:
+                blocks.append({"type": "code", "content": content})
+            elif content:
+                blocks.append({"type": "text", "content": content})
+            is_code = not is_code
+
+        blocks = blocks or [{"type": "text", "content": response_text}]
+        _cache_put(key, blocks)
+        return blocks
 
     except Exception as e:
-        logger.error(f"Bedrock classification failed: {e}")
-        return [{"type": "text", "content": prompt}]
+        logger.error("Bedrock classification failed: %s", e)
+        raise RuntimeError("Bedrock classification failed; please retry.") from e
+
 
+# Recap persistence runs off the request thread
+PERSIST_TIMEOUT = 5.0
+_PERSIST_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="persist")
 
-def create_recap_from_log(chat_log: str, session_id: str) -> Dict[str, Any]:
-    """Process chat logs and generate a structured recap payload (JSON-serializable dict)."""
+
+def _persist_recap(recap_payload: Dict[str, Any], session_id: str) -> None:
+    """Store the recap via the memory handler; raise RuntimeError on failure."""
+    success = store_recap("last_recap", recap_payload, session_id=session_id)
+    if not success:
+        logger.error("Failed to persist recap for session %s", session_id)
+        raise RuntimeError("Unable to persist recap; please retry.")
+
+
+def _log_persist_failure(future: "Future[None]") -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background recap persistence failed: %s", exc)
+
+
+def create_recap_from_log(
+    chat_log: str, session_id: str, strict_persist: bool = True
+) -> Dict[str, Any]:
+    """
+    Process chat logs and generate a structured recap payload (JSON-serializable dict).
+    With strict_persist (default) the recap must be stored within PERSIST_TIMEOUT
+    or RuntimeError is raised; otherwise storage finishes in the background.
+    """
     if not chat_log or not isinstance(chat_log, str):
         raise ValueError("Invalid or missing 'chat_log' (must be a non-empty string).")
 
     # ✅ Early guardrail
     validate_input_length(chat_log)
-    enforce_size_limit(chat_log)
-    if contains_deny_terms(chat_log):
-        raise ValueError("Input contains unsafe terms.")
-    chat_log = scrub_pii(chat_log)
+    chat_log = filter_pipeline(chat_log)
 
     full_prompt = f"{load_prompts()}\n\n{chat_log}"
     blocks = classify_with_bedrock(full_prompt)
 
-    validated_blocks: List[Dict[str, Any]] = []
-    for block in blocks:
-        if block.get("type") == "code":
-            result = validate_snippet(block.get("content", ""))
-            block["validation"] = result
-        validated_blocks.append(block)
-
-    recap_dict: Dict[str, Any] = diff_code_blocks(validated_blocks)
+    # Validation happens inside the diff traversal, so blocks are walked once
+    recap_dict: Dict[str, Any] = diff_code_blocks(blocks, validator=validate_snippet)
 
     # 🚧 Shim for legacy keys → canonical schema
     # TODO: Remove once diffcheck emits schema-compliant fields directly
@@ -160,52 +304,84 @@ def create_recap_from_log(chat_log: str, session_id: str) -> Dict[str, Any]:
     if "text_summary" in recap_dict:
         recap_dict["summary"] = recap_dict.pop("text_summary")
 
-    recap_model: Recap = Recap.model_validate(recap_dict)
+    recap_model: Recap = _RECAP_ADAPTER.validate_python(recap_dict)
     recap_payload: Dict[str, Any] = format_recap(recap_model)
 
-    success = store_recap("last_recap", recap_payload, session_id=session_id)
-    if not success:
-        logger.error("Failed to persist recap for session %s", session_id)
-        raise RuntimeError("Unable to persist recap; please retry.")
+    persisted = _PERSIST_POOL.submit(_persist_recap, recap_payload, session_id)
+    if not strict_persist:
+        persisted.add_done_callback(_log_persist_failure)
+        return recap_payload
+
+    try:
+        persisted.result(timeout=PERSIST_TIMEOUT)
+    except FuturesTimeout as e:
+        logger.error("Timed out persisting recap for session %s", session_id)
+        raise RuntimeError("Unable to persist recap; please retry.") from e
 
     return recap_payload
 
 
-def process_recap_request(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
-    """Encapsulate request handling to keep the route thin and testable."""
+def process_recap_request(
+    data: Union[Dict[str, Any], bytes],
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Encapsulate request handling to keep the route thin and testable.
+    Raw JSON bytes are parsed and validated in a single pydantic-core pass.
+    """
     try:
-        parsed = RecapRequest(**data)
-        recap = create_recap_from_log(parsed.chat_log, parsed.session_id)
+        if isinstance(data, bytes):
+            enforce_size_limit_bytes(data)
+            parsed = _RECAP_REQUEST_ADAPTER.validate_json(data)
+        else:
+            parsed = _RECAP_REQUEST_ADAPTER.validate_python(data)
+        recap = create_recap_from_log(
+            parsed.chat_log, parsed.session_id, strict_persist=False
+        )
         return recap, HttpStatus.OK
 
     except ValidationError as ve:
-        logger.warning(f"Validation error: {ve}")
+        logger.warning("Validation error: %s", ve)
         return {
             "error": "Invalid request format or missing fields."
         }, HttpStatus.BAD_REQUEST
     except ValueError as ve:
-        logger.warning(f"Value error: {ve}")
+        logger.warning("Value error: %s", ve)
         return {"error": str(ve)}, HttpStatus.BAD_REQUEST
     except RuntimeError as re:
-        logger.error(f"Runtime error: {re}")
+        logger.error("Runtime error: %s", re)
         return {"error": str(re)}, HttpStatus.INTERNAL_SERVER_ERROR
     except Exception as e:
-        logger.critical(f"Unhandled error: {e}\n{traceback.format_exc()}")
+        logger.critical("Unhandled error: %s", e, exc_info=True)
         return {"error": "Internal server error."}, HttpStatus.INTERNAL_SERVER_ERROR
 
 
-@app.route("/v1/recap", methods=["POST"])
-def generate_recap() -> Union[Response, Tuple[Response, int]]:
+def json_response(data: Dict[str, Any], status: int = HttpStatus.OK) -> Response:
+    """Serialize a payload with orjson straight into a Flask Response."""
+    return Response(orjson.dumps(data), status=status, mimetype=ContentType.JSON)
+
+
+def generate_recap() -> Response:
     """Classify chat content and produce a structured recap."""
     if request.content_type != ContentType.JSON:
-        return (
-            jsonify({"error": "Content-Type must be application/json"}),
+        return json_response(
+            {"error": "Content-Type must be application/json"},
             HttpStatus.UNSUPPORTED_MEDIA_TYPE,
         )
 
-    data: Dict[str, Any] = request.get_json(force=True)
-    response, status = process_recap_request(data)
-    return jsonify(response), status
+    response, status = process_recap_request(request.get_data(cache=False))
+    return json_response(response, status)
+
+
+def create_app() -> Flask:
+    """Build the Flask app serving /v1/recap; shares this module's Bedrock client."""
+    flask_app = Flask(__name__)
+    CORS(flask_app)
+    flask_app.add_url_rule("/v1/recap", view_func=generate_recap, methods=["POST"])
+    return flask_app
+
+
+# Flask app setup
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,3 @@
-from backend.app import app as backend_app
+from api_recap import app as backend_app, create_app
 
-__all__ = ["backend_app"]
+__all__ = ["backend_app", "create_app"]
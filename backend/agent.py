@@ -15,98 +15,309 @@ Everything else stays the same: robust Strands parsing + schema-safe normalizati
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
 import html
-import json
 import logging
-import re
+import os
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-# Real AWS AgentCore imports
-from bedrock_agentcore import BedrockAgentCoreApp  # must exist in your env
-from strands import Agent  # must exist in your env
+import orjson
 
-# Schema + formatter (optional, but expected)
-try:
-    from backend.schema import Recap  # Pydantic model
-except Exception:
-    Recap = None  # tolerate absence
 
-try:
-    from backend.recap_formatter import format_recap
-except Exception:
+def _fallback_format_recap(model):  # graceful fallback
+    try:
+        return model.model_dump()  # type: ignore[attr-defined]
+    except Exception:
+        return {}
 
-    def format_recap(model):  # graceful fallback
-        try:
-            return model.model_dump()  # type: ignore[attr-defined]
-        except Exception:
-            return {}
+
+@lru_cache(maxsize=1)
+def _recap_schema() -> Tuple[Any, Any, Callable[[Any], Dict[str, Any]]]:
+    """
+    Schema + formatter (optional, but expected), imported on first use so the
+    pydantic model build (~85 ms) stays off module import.
+    Returns (AgentAnalysis, Recap's compiled JSON validator, format_recap);
+    the models are None when backend.schema is unavailable.
+    """
+    try:
+        from backend.schema import AgentAnalysis, Recap  # Pydantic models
+    except Exception:
+        return None, None, _fallback_format_recap  # tolerate absence
+    try:
+        from backend.recap_formatter import format_recap
+    except Exception:
+        format_recap = _fallback_format_recap
+    # validate_json parses and validates bytes in one pass, no intermediate dict
+    return AgentAnalysis, Recap.__pydantic_validator__.validate_json, format_recap
 
 
-# Configure logging to stdout for CloudWatch
+# Configure logging to stdout for CloudWatch (LOG_LEVEL=DEBUG restores traces)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     stream=sys.stdout,
     force=True,
 )
 logger = logging.getLogger(__name__)
 
-# Initialize AWS AgentCore app and agent
-app = BedrockAgentCoreApp()
-agent = Agent()
+# AWS AgentCore app and Strands agent are both built on first use; the
+# module-level "app" name resolves through __getattr__ below
+_APP: Any = None
+agent: Any = None
+_AGENT_INIT_LOCK = threading.Lock()
+
+# Bedrock model for the agent (Strands default if unset). Latency-optimized
+# inference is opt-in: only some models/regions offer it (e.g. Claude 3.5 Haiku
+# in us-east-2) and Bedrock rejects the setting elsewhere
+AGENT_MODEL_ID = os.environ.get("AGENT_MODEL_ID")
+AGENT_LATENCY = os.environ.get("AGENT_LATENCY", "standard")
+# Mark the static system prompt as a Bedrock cache checkpoint. Off by default:
+# Bedrock only caches prefixes past the model minimum (1,024 tokens on Sonnet)
+AGENT_PROMPT_CACHE = os.environ.get("AGENT_PROMPT_CACHE", "0") == "1"
+
+# Cap concurrent Strands/Bedrock calls per process; excess requests queue here
+AGENT_MAX_CONCURRENCY = int(os.environ.get("AGENT_MAX_CONCURRENCY", "8"))
+_AGENT_SLOTS = threading.BoundedSemaphore(AGENT_MAX_CONCURRENCY)
+
+# Most transcripts one chat_logs request may carry; each item takes a worker
+# thread, so larger batches are refused rather than flooding the executor
+MAX_BATCH = int(os.environ.get("AGENT_MAX_BATCH", "16"))
+
+# Agent calls currently running, so identical concurrent prompts share one call
+_INFLIGHT: Dict[str, "Future[Any]"] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Parsed analyses of earlier transcripts, keyed by prompt hash (LRU)
+ANALYSIS_CACHE_MAX = int(os.environ.get("AGENT_CACHE_MAX", "256"))
+_ANALYSIS_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+
+def _prompt_key(prompt: str) -> str:
+    """Stable, compact key for a reasoning prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _analysis_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _ANALYSIS_CACHE_LOCK:
+        cached = _ANALYSIS_CACHE.get(key)
+        if cached is None:
+            return None
+        _ANALYSIS_CACHE.move_to_end(key)
+    return copy.deepcopy(cached)
+
+
+def _analysis_cache_put(key: str, analysis: Dict[str, Any]) -> None:
+    with _ANALYSIS_CACHE_LOCK:
+        _ANALYSIS_CACHE[key] = copy.deepcopy(analysis)
+        _ANALYSIS_CACHE.move_to_end(key)
+        while len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_MAX:
+            _ANALYSIS_CACHE.popitem(last=False)
+
+
+_BANNER = "=" * 80
+
+
+def _get_agent() -> Any:
+    """
+    Return the process-wide Strands agent, importing strands and building it
+    on the first call so cold starts and non-serving imports skip that cost.
+    """
+    global agent
+    if agent is None:
+        with _AGENT_INIT_LOCK:
+            if agent is None:
+                from strands import Agent  # must exist in your env
+                from strands.models import BedrockModel
+
+                model_config: Dict[str, Any] = {}
+                if AGENT_MODEL_ID:
+                    model_config["model_id"] = AGENT_MODEL_ID
+                if AGENT_LATENCY != "standard":
+                    model_config["additional_args"] = {
+                        "performanceConfig": {"latency": AGENT_LATENCY}
+                    }
+                agent = Agent(
+                    model=BedrockModel(**model_config),
+                    system_prompt=list(_SYSTEM_PROMPT_BLOCKS),
+                    callback_handler=None,
+                )
+    return agent
+
+
+def _get_app() -> Any:
+    """
+    Return the AgentCore app with invoke registered, importing
+    bedrock_agentcore (~230 ms cold) only when something actually serves.
+    """
+    global _APP
+    if _APP is None:
+        with _AGENT_INIT_LOCK:
+            if _APP is None:
+                from bedrock_agentcore import BedrockAgentCoreApp  # must exist
+
+                built = BedrockAgentCoreApp()
+                built.entrypoint(invoke)
+                _APP = built
+    return _APP
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `backend.agent.app` working for the AgentCore runtime and tooling
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _conversation_for(base: Any) -> Any:
+    """
+    A Strands Agent keeps conversation history and raises ConcurrencyException
+    when invoked while busy, so each recap gets its own Agent over the shared
+    model and boto client (~0.2 ms). Output is constrained to AgentAnalysis via
+    Bedrock tool use. Non-Strands callables pass through.
+    """
+    from strands import Agent  # already imported by _get_agent()
+
+    if not isinstance(base, Agent):
+        return base
+    analysis_model, _, _ = _recap_schema()
+    return Agent(
+        model=base.model,
+        system_prompt=list(_SYSTEM_PROMPT_BLOCKS),
+        structured_output_model=analysis_model,
+        callback_handler=None,
+    )
+
+
+def _invoke_conversation(base: Any, prompt: str) -> Any:
+    """
+    Run one recap through a fresh conversation. If the model still answers in
+    text after Strands forces the AgentAnalysis tool, StructuredOutputException
+    is raised; fall back to parsing the JSON from its last text reply instead
+    of failing the invocation.
+    """
+    from strands.types.exceptions import StructuredOutputException
+
+    conversation = _conversation_for(base)
+    try:
+        return conversation(prompt)
+    except StructuredOutputException:
+        for message in reversed(getattr(conversation, "messages", None) or []):
+            if message.get("role") != "assistant":
+                continue
+            for block in message.get("content") or []:
+                parsed = _extract_json_from_text(block.get("text") or "")
+                if isinstance(parsed, dict) and parsed:
+                    logger.warning("Structured output not returned; using text reply")
+                    return parsed
+        raise
 
 
-def debug_print(msg: str):
-    """Print with flush for immediate CloudWatch visibility"""
-    print(msg, flush=True)
+def debug_print(msg: str, *args: Any) -> None:
+    """Trace-level progress line; formatted lazily, dropped unless DEBUG is on"""
+    logger.debug(msg, *args)
 
 
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
 
-_JSON_FENCE = re.compile(r"```json\s*(.+?)\s*```", re.DOTALL | re.IGNORECASE)
+_FENCE = "```"
+_JSON_TAG = "json"
+
+
+def _json_fence_body(text: str) -> Optional[str]:
+    """
+    Return the body of the first ```json fenced block (tag is case-insensitive),
+    or None if there is no closed one. Plain str.find scans, no regex.
+    """
+    start = text.find(_FENCE)
+    while start != -1:
+        body = start + len(_FENCE)
+        if text[body : body + len(_JSON_TAG)].lower() == _JSON_TAG:
+            body += len(_JSON_TAG)
+            end = text.find(_FENCE, body)
+            return text[body:end] if end != -1 else None
+        start = text.find(_FENCE, start + 1)
+    return None
 
 
 def _extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
-    """Extract dict from either a ```json fenced block or raw JSON string."""
+    """
+    Extract dict from a ```json fenced block or a raw JSON string, falling
+    back to the outermost {...} span (prose-wrapped or bare ``` fenced JSON).
+    """
     if not isinstance(text, str):
         return None
-    m = _JSON_FENCE.search(text)
-    raw = m.group(1) if m else text
-    raw = raw.strip()
+    fenced = _json_fence_body(text)
+    # JSON tolerates surrounding whitespace, so no strip() copy is needed
     try:
-        return json.loads(raw)
+        return orjson.loads(text if fenced is None else fenced)
+    except Exception:
+        pass
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        return orjson.loads(text[start : end + 1])
     except Exception:
         return None
 
 
 def _looks_like_agent_wrapper(d: Dict[str, Any]) -> bool:
     """Detect a Strands-style wrapper: {'role':'assistant','content':[{'text': '...'}]}"""
-    if not isinstance(d, dict):
+    # One probe for content on the happy path; non-dicts and misses land in except
+    try:
+        content = d["content"]
+    except (KeyError, TypeError):
         return False
-    if "role" in d and "content" in d and isinstance(d["content"], list):
-        if (
-            d["content"]
-            and isinstance(d["content"][0], dict)
-            and "text" in d["content"][0]
-        ):
-            return True
-    return False
+    return (
+        "role" in d
+        and isinstance(content, list)
+        and bool(content)
+        and isinstance(content[0], dict)
+        and "text" in content[0]
+    )
 
 
 def _parse_agent_result(result: Any) -> Dict[str, Any]:
     """
     Convert Strands result into the analysis dict with keys like aha_moments, code_snippets, etc.
     Order:
-      1) result.content[0].text
-      2) result.message (wrapper or raw/fenced JSON)
-      3) dict wrapper
-      4) already-dict
+      1) dict wrapper, or already-dict (returned as-is)
+      2) result.structured_output (schema-constrained via tool use)
+      3) result.content[0].text
+      4) result.message (wrapper or raw/fenced JSON)
       5) {}
     """
-    # 1) content[0].text
+    # 1) dict wrapper or already-dict: no attribute probes or JSON re-parse
+    if isinstance(result, dict):
+        if _looks_like_agent_wrapper(result):
+            try:
+                text = result["content"][0].get("text", "")
+                parsed = _extract_json_from_text(text)
+                if isinstance(parsed, dict) and parsed:
+                    return parsed
+            except Exception:
+                pass
+        return result
+
+    # 2) structured output: already validated, no text parsing at all
+    structured = getattr(result, "structured_output", None)
+    if structured is not None:
+        analysis_model, _, _ = _recap_schema()
+        if analysis_model is not None and isinstance(structured, analysis_model):
+            return structured.model_dump()
+
+    # 3) content[0].text
     try:
         content = getattr(result, "content", None)
         if isinstance(content, list) and content and isinstance(content[0], dict):
@@ -117,7 +328,7 @@ def _parse_agent_result(result: Any) -> Dict[str, Any]:
     except Exception:
         pass
 
-    # 2) message
+    # 4) message
     try:
         message = getattr(result, "message", None)
         if isinstance(message, dict) and _looks_like_agent_wrapper(message):
@@ -134,18 +345,6 @@ def _parse_agent_result(result: Any) -> Dict[str, Any]:
     except Exception:
         pass
 
-    # 3) dict wrapper or already-dict
-    if isinstance(result, dict):
-        if _looks_like_agent_wrapper(result):
-            try:
-                text = result["content"][0].get("text", "")
-                parsed = _extract_json_from_text(text)
-                if isinstance(parsed, dict) and parsed:
-                    return parsed
-            except Exception:
-                pass
-        return result
-
     # Fallback
     return {}
 
@@ -186,11 +385,13 @@ def _normalize_for_schema(analysis: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _to_html_list(items: List[str]) -> str:
+def _to_html_list(items: List[Any]) -> str:
     if not items:
         return ""
-    safe = "".join(f"<li>{html.escape(str(i))}</li>" for i in items)
-    return f"<ul>{safe}</ul>"
+    # One join over escaped items beats building N small "<li>" f-strings
+    escape = html.escape
+    safe = "</li><li>".join([escape(str(i)) for i in items])
+    return f"<ul><li>{safe}</li></ul>"
 
 
 def _generate_human_summary_html(analysis: Dict[str, Any]) -> str:
@@ -206,34 +407,29 @@ def _generate_human_summary_html(analysis: Dict[str, Any]) -> str:
     snips = analysis.get("code_snippets") or []
     summary = html.escape(analysis.get("summary") or "")
 
-    parts: List[str] = []
-    parts.append(f"<h2>Session: {session_id}</h2>")
+    parts: List[str] = [f"<h2>Session: {session_id}</h2>"]
 
     if summary:
-        parts.append("<h3>Summary</h3>")
-        parts.append(f"<p>{summary}</p>")
-
-    if aha:
-        parts.append("<h3>Key Insights</h3>")
-        parts.append(_to_html_list([str(a) for a in aha]))
+        parts.append(f"<h3>Summary</h3><p>{summary}</p>")
 
-    if mvp:
-        parts.append("<h3>MVP Changes</h3>")
-        parts.append(_to_html_list([str(c) for c in mvp]))
-
-    if tradeoffs:
-        parts.append("<h3>Design Tradeoffs</h3>")
-        parts.append(_to_html_list([str(t) for t in tradeoffs]))
+    # One append per section; _to_html_list stringifies and escapes items itself
+    for title, items in (
+        ("Key Insights", aha),
+        ("MVP Changes", mvp),
+        ("Design Tradeoffs", tradeoffs),
+    ):
+        if items:
+            parts.append(f"<h3>{title}</h3>{_to_html_list(items)}")
 
     # FIX: Code snippets - show actual code content, not just labels
     if snips:
-        parts.append("<h3>Code Discovered</h3>")
         snippet_items = []
         for s in snips[:3]:  # Limit to first 3 snippets
             # Handle both old schema (code/description) and new schema (content/context)
-            code_content = (s or {}).get("content") or (s or {}).get("code", "")
-            code_context = (s or {}).get("context") or (s or {}).get("description", "")
-            lang = (s or {}).get("language", "text")
+            s = s or {}
+            code_content = s.get("content") or s.get("code", "")
+            code_context = s.get("context") or s.get("description", "")
+            lang = s.get("language", "text")
 
             # Build snippet display with actual code preview
             if code_content:
@@ -251,19 +447,48 @@ def _generate_human_summary_html(analysis: Dict[str, Any]) -> str:
                     f"<strong>[{html.escape(lang)}]</strong> {html.escape(code_context)}"
                 )
 
+        parts.append("<h3>Code Discovered</h3>")
         if snippet_items:
             parts.append(
                 "<ul>" + "".join(f"<li>{item}</li>" for item in snippet_items) + "</ul>"
             )
 
     if post:
-        parts.append("<h3>Post-MVP Ideas</h3>")
-        parts.append(_to_html_list([str(p) for p in post]))
+        parts.append(f"<h3>Post-MVP Ideas</h3>{_to_html_list(post)}")
 
-    html_text = "".join(parts).strip()
+    html_text = "".join(parts)
     return html_text or "<p>No structured insights were returned by the agent.</p>"
 
 
+# Static reasoning-extraction instructions, sent as the agent's system prompt so
+# the invariant prefix precedes the per-call transcript (the user turn).
+# Read the full prompt from classifier_prompt.md if available
+# For now, use inline version
+_REASONING_SYSTEM_PROMPT = """
+You are Ariadne Clew, a reasoning preservation agent for AI-native builders.
+
+Analyze this chat transcript and extract structured insights:
+
+1. **Aha moments**: Key insights or discoveries
+2. **MVP changes**: Scope edits, pivots, feature decisions
+3. **Code snippets**: All code blocks with language and context
+4. **Design tradeoffs**: Explicit rationale for choices
+5. **Scope creep**: Evidence of expanding beyond MVP
+6. **README notes**: Facts that belong in documentation
+7. **Post-MVP ideas**: Features deferred for later
+8. **Quality flags**: Warnings or praise (with severity)
+9. **Quality scores**: Numerical assessments if mentioned
+
+Answer by calling the AgentAnalysis tool; do not write the JSON out as text. Its fields are: session_id, aha_moments, mvp_changes, code_snippets (with content, language, user_marked_final, context, file), design_tradeoffs, scope_creep, readme_notes, post_mvp_ideas, quality_flags (with issue, severity, file), quality_scores (with component, score, rationale), summary.
+
+The user message is the chat transcript to analyze.
+"""
+
+_SYSTEM_PROMPT_BLOCKS: List[Dict[str, Any]] = [{"text": _REASONING_SYSTEM_PROMPT}]
+if AGENT_PROMPT_CACHE:
+    _SYSTEM_PROMPT_BLOCKS.append({"cachePoint": {"type": "default"}})
+
+
 # -----------------------------------------------------------------------------
 # Core class
 # -----------------------------------------------------------------------------
@@ -274,21 +499,25 @@ class AriadneClew:
     AWS AgentCore-powered reasoning agent using the real BedrockAgentCoreApp.
     """
 
+    # One per request (and per batch item): no __dict__ to allocate
+    __slots__ = ("session_id", "agent")
+
     def __init__(self, session_id: str = "default"):
         self.session_id = session_id
-        self.app = app
-        self.agent = agent
-        debug_print(f"🎯 AriadneClew initialized for session: {session_id}")
+        self.agent = _get_agent()
+        debug_print("🎯 AriadneClew initialized for session: %s", session_id)
 
-    def process_transcript_sync(self, chat_log: str) -> Dict[str, Any]:
+    async def process_transcript(self, chat_log: str) -> Dict[str, Any]:
         """
         Build prompt → call Strands → parse → human_readable (HTML) + structured
+        The blocking Strands call runs in a worker thread so the event loop
+        keeps serving other invocations meanwhile.
         """
-        debug_print("=" * 80)
+        debug_print(_BANNER)
         debug_print("🚀 STARTING TRANSCRIPT PROCESSING")
-        debug_print(f"Session ID: {self.session_id}")
-        debug_print(f"Chat log length: {len(chat_log)} chars")
-        debug_print("=" * 80)
+        debug_print("Session ID: %s", self.session_id)
+        debug_print("Chat log length: %d chars", len(chat_log))
+        debug_print(_BANNER)
 
         if not chat_log or not isinstance(chat_log, str):
             raise ValueError("Invalid chat_log: must be non-empty string")
@@ -296,57 +525,81 @@ class AriadneClew:
         # 1) Build prompt
         debug_print("📝 Building reasoning prompt...")
         prompt = self._build_reasoning_prompt(chat_log)
-        debug_print(f"✓ Prompt built: {len(prompt)} chars")
-
-        # 2) Call Strands
-        debug_print("🤖 Calling Strands agent...")
-        result = self.agent(prompt)
-        debug_print("✓ Strands agent returned")
-
-        # 3) Parse
-        debug_print("🔧 Extracting analysis from result...")
-        analysis = _parse_agent_result(result)
-        if not analysis:
-            debug_print("⚠️  No analysis extracted; defaulting to empty dict.")
-            analysis = {}
-        analysis["session_id"] = self.session_id
-        debug_print("✓ Analysis extracted")
+        debug_print("✓ Prompt built: %d chars", len(prompt))
+
+        # 2) Call Strands, unless this transcript was already analysed
+        key = _prompt_key(prompt)
+        analysis = _analysis_cache_get(key)
+        if analysis is not None:
+            debug_print("✓ Analysis cache hit %s; skipping Strands call", key)
+        else:
+            debug_print("🤖 Calling Strands agent...")
+            result = await asyncio.to_thread(self._call_agent, prompt, key)
+            debug_print("✓ Strands agent returned")
+
+            # 3) Parse
+            debug_print("🔧 Extracting analysis from result...")
+            analysis = _parse_agent_result(result)
+            if not analysis:
+                debug_print("⚠️  No analysis extracted; defaulting to empty dict.")
+                analysis = {}
+            else:
+                _analysis_cache_put(key, analysis)
+            debug_print("✓ Analysis extracted")
+        # Copy before stamping: a shared in-flight result may back this dict
+        analysis = {**analysis, "session_id": self.session_id}
 
         # 4) Format
         debug_print("🎨 Formatting for output...")
         recap = self._format_for_demo(analysis)
         debug_print("✓ Formatting complete")
 
-        debug_print("=" * 80)
+        debug_print(_BANNER)
         debug_print("✅ TRANSCRIPT PROCESSING COMPLETE")
-        debug_print("=" * 80)
+        debug_print(_BANNER)
 
         return recap
 
-    def _build_reasoning_prompt(self, chat_log: str) -> str:
-        """Build the reasoning extraction prompt for AgentCore"""
-        # Read the full prompt from classifier_prompt.md if available
-        # For now, use inline version
-        return f"""
-You are Ariadne Clew, a reasoning preservation agent for AI-native builders.
+    def process_transcript_sync(self, chat_log: str) -> Dict[str, Any]:
+        """Blocking wrapper around process_transcript for callers without a loop."""
+        return asyncio.run(self.process_transcript(chat_log))
 
-Analyze this chat transcript and extract structured insights:
+    def _call_agent(self, prompt: str, key: str) -> Any:
+        """
+        Invoke the Strands agent, holding one of the per-process call slots.
+        Concurrent invocations with the same prompt wait on the first one's
+        result instead of paying for another model round trip.
+        """
+        with _INFLIGHT_LOCK:
+            pending = _INFLIGHT.get(key)
+            owner = pending is None
+            if pending is None:
+                pending = _INFLIGHT[key] = Future()
 
-1. **Aha moments**: Key insights or discoveries
-2. **MVP changes**: Scope edits, pivots, feature decisions
-3. **Code snippets**: All code blocks with language and context
-4. **Design tradeoffs**: Explicit rationale for choices
-5. **Scope creep**: Evidence of expanding beyond MVP
-6. **README notes**: Facts that belong in documentation
-7. **Post-MVP ideas**: Features deferred for later
-8. **Quality flags**: Warnings or praise (with severity)
-9. **Quality scores**: Numerical assessments if mentioned
+        if not owner:
+            debug_print("  ↺ Joining in-flight agent call %s", key)
+            return pending.result()
 
-Return ONLY valid JSON with fields: session_id, aha_moments, mvp_changes, code_snippets (with content, language, user_marked_final, context, file), design_tradeoffs, scope_creep, readme_notes, post_mvp_ideas, quality_flags (with issue, severity, file), quality_scores (with component, score, rationale), summary.
+        try:
+            with _AGENT_SLOTS:
+                result = _invoke_conversation(self.agent, prompt)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+
+    @property
+    def app(self) -> Any:
+        """The process-wide BedrockAgentCoreApp, built on first access."""
+        return _get_app()
 
-Chat transcript:
-{chat_log}
-"""
+    def _build_reasoning_prompt(self, chat_log: str) -> str:
+        """Build the per-call user turn; instructions live in the system prompt"""
+        return chat_log
 
     def _format_for_demo(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Format output for the demo/bridge while validating against Recap if present."""
@@ -358,14 +611,14 @@ Chat transcript:
         # Schema normalize + validate
         try:
             safe = _normalize_for_schema(analysis)
-            if Recap is not None:
-                recap_model = Recap.model_validate(safe)
-                structured_data = format_recap(recap_model)
+            _, validate_json, format_recap = _recap_schema()
+            if validate_json is not None:
+                structured_data = format_recap(validate_json(orjson.dumps(safe)))
             else:
                 structured_data = analysis
             debug_print("  ✅ Schema validation passed (or skipped)")
         except Exception as e:
-            debug_print(f"  ⚠️  Schema validation failed: {e}")
+            debug_print("  ⚠️  Schema validation failed: %s", e)
             structured_data = analysis  # fallback
 
         return {
@@ -376,8 +629,8 @@ Chat transcript:
                 "processed_by": "AriadneClew",
                 "agentcore_runtime": "BedrockAgentCoreApp",
                 "strands_agent": True,
-                "code_snippets_found": len(analysis.get("code_snippets", [])),
-                "insights_extracted": len(analysis.get("aha_moments", [])),
+                "code_snippets_found": len(analysis.get("code_snippets") or ()),
+                "insights_extracted": len(analysis.get("aha_moments") or ()),
             },
         }
 
@@ -387,20 +640,41 @@ Chat transcript:
 # -----------------------------------------------------------------------------
 
 
-@app.entrypoint
-def invoke(payload):
+# Exception text can echo model output or transcript content; keep error
+# responses and log lines bounded regardless of what was raised
+_MAX_ERROR_CHARS = 512
+
+
+def _error_message(e: BaseException) -> str:
+    """Constant-bounded error string for entrypoint responses."""
+    return f"AgentCore entrypoint failed: {str(e)[:_MAX_ERROR_CHARS]}"
+
+
+# Registered as the AgentCore entrypoint by _get_app()
+async def invoke(payload):
     """
     AWS AgentCore entrypoint for Ariadne Clew.
+    Accepts one transcript (chat_log/prompt/message) or a list under
+    chat_logs; batched transcripts are analysed concurrently and come back
+    as a per-item results list in input order.
     """
-    debug_print("=" * 80)
+    debug_print(_BANNER)
     debug_print("🎯 AGENTCORE ENTRYPOINT INVOKED")
-    debug_print(f"  Payload type: {type(payload)}")
-    debug_print(
-        f"  Payload keys: {list(payload.keys()) if isinstance(payload, dict) else 'NOT A DICT'}"
-    )
-    debug_print("=" * 80)
+    if logger.isEnabledFor(logging.DEBUG):
+        debug_print("  Payload type: %s", type(payload))
+        debug_print(
+            "  Payload keys: %s",
+            list(payload.keys()) if isinstance(payload, dict) else "NOT A DICT",
+        )
+    debug_print(_BANNER)
 
     try:
+        chat_logs = payload.get("chat_logs")
+        if isinstance(chat_logs, list) and chat_logs:
+            return await _invoke_batch(
+                chat_logs, payload.get("session_id", "agentcore-session")
+            )
+
         chat_log = (
             payload.get("chat_log") or payload.get("prompt") or payload.get("message")
         )
@@ -408,28 +682,55 @@ def invoke(payload):
 
         if not chat_log:
             error_msg = "Missing chat content."
-            debug_print(f"  ❌ {error_msg}")
+            debug_print("  ❌ %s", error_msg)
             return {"error": error_msg, "status": "failed"}
 
         ariadne = AriadneClew(session_id=session_id)
-        result = ariadne.process_transcript_sync(chat_log)
+        result = await ariadne.process_transcript(chat_log)
 
-        debug_print("=" * 80)
+        debug_print(_BANNER)
         debug_print("✅ AGENTCORE ENTRYPOINT COMPLETE")
-        debug_print("=" * 80)
+        debug_print(_BANNER)
 
         return {"status": "success", "result": result}
 
     except Exception as e:
-        error_msg = f"AgentCore entrypoint failed: {str(e)}"
-        debug_print("=" * 80)
-        debug_print(f"❌ ENTRYPOINT ERROR: {error_msg}")
-        debug_print("=" * 80)
+        error_msg = _error_message(e)
+        debug_print(_BANNER)
+        debug_print("❌ ENTRYPOINT ERROR: %s", error_msg)
+        debug_print(_BANNER)
         logger.error(error_msg, exc_info=True)
         return {"status": "failed", "error": error_msg}
 
 
+async def _invoke_batch(chat_logs: List[Any], session_id: str) -> Dict[str, Any]:
+    """Run each transcript through its own AriadneClew; failures stay per item."""
+    if len(chat_logs) > MAX_BATCH:
+        return {
+            "status": "failed",
+            "error": f"Too many transcripts ({len(chat_logs)}); limit is {MAX_BATCH}.",
+        }
+
+    async def one(i: int, chat_log: Any) -> Dict[str, Any]:
+        if not chat_log or not isinstance(chat_log, str):
+            return {"status": "failed", "error": "Missing chat content."}
+        try:
+            ariadne = AriadneClew(session_id=f"{session_id}-{i}")
+            return {
+                "status": "success",
+                "result": await ariadne.process_transcript(chat_log),
+            }
+        except Exception as e:
+            error_msg = _error_message(e)
+            logger.error("Batch item %d failed: %s", i, error_msg, exc_info=True)
+            return {"status": "failed", "error": error_msg}
+
+    results = await asyncio.gather(*(one(i, c) for i, c in enumerate(chat_logs)))
+    debug_print("✅ AGENTCORE BATCH COMPLETE: %d transcripts", len(results))
+    return {"status": "success", "results": list(results)}
+
+
 # For local bare run (AgentCore will normally handle the service lifecycle)
 if __name__ == "__main__":
-    debug_print("🚀 Starting Ariadne Clew AgentCore app...")
-    app.run()
+    logger.info("🚀 Starting Ariadne Clew AgentCore app...")
+    _get_app().run()
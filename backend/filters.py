@@ -1,35 +1,81 @@
 # backend/filters.py
 import re
+from functools import lru_cache
+from typing import Tuple
 
 # Example deny-listed terms — extend as needed
 DENY_TERMS = ["api_key", "password", "secret", "rm -rf /", "BEGIN RSA PRIVATE KEY"]
 MAX_CHARS = 100_000  # ~20k tokens max
+# Most bytes a JSON body can spend on one character (a \uXXXX surrogate pair),
+# plus headroom for the surrounding object and its other fields
+MAX_JSON_BYTES_PER_CHAR = 12
+JSON_ENVELOPE_BYTES = 4096
 PII_PATTERNS = [
     (re.compile(r"\b\d{3}-\d{2}-\d{4}\b"), "[SSN_REDACTED]"),  # SSN pattern
     (re.compile(r"\b\d{16}\b"), "[CC_REDACTED]"),  # naive credit card
+    # Email parts are capped at the RFC 5321 limits (64-char local part,
+    # 255-char domain, 24-char TLD) so a long run of dots or dashes cannot
+    # drive the regex into quadratic backtracking
     (
-        re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+        re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b"),
         "[EMAIL_REDACTED]",
     ),  # email
     (re.compile(r"\b\d{3}-\d{3}-\d{4}\b"), "[PHONE_REDACTED]"),  # phone number
 ]
 
-# Precompiled deny term patterns (case-insensitive)
+# Precompiled deny term pattern (case-insensitive), one alternation so the
+# transcript is scanned once regardless of how many terms are listed.
 # Use word boundaries for simple words, but exact match for complex phrases
-_DENY_PATTERNS = []
+_deny_parts = []
 for term in DENY_TERMS:
     if " " in term or any(char in term for char in ["-", "/", "\\", "."]):
         # For phrases with spaces or special chars, use exact string matching
-        pattern = re.compile(re.escape(term), re.IGNORECASE)
+        _deny_parts.append(re.escape(term))
     else:
         # For single words, use word boundaries
-        pattern = re.compile(rf"\b{re.escape(term)}\b", re.IGNORECASE)
-    _DENY_PATTERNS.append(pattern)
+        _deny_parts.append(rf"\b{re.escape(term)}\b")
+_DENY_REGEX = re.compile("|".join(_deny_parts), re.IGNORECASE)
+
+# Every deny term is a literal, so for ASCII text a C-level substring scan over
+# a lowercased copy rules out the common clean transcript without entering the
+# regex engine; the regex only runs to confirm word boundaries on a literal hit.
+# Non-ASCII text always goes to the regex: Unicode case folding (e.g. U+0130,
+# U+0131) does not line up with re.IGNORECASE, so a prefilter could miss.
+_DENY_LITERALS = tuple(term.lower() for term in DENY_TERMS)
+_DENY_PREFILTER = all(term.isascii() for term in DENY_TERMS)
+
+# Literal each PII pattern cannot match without, keyed by its replacement so
+# the anchor follows the pattern wherever it sits in PII_PATTERNS; patterns
+# missing here are always scanned ("" is in every string). A plain `in` check
+# is a C memchr, so patterns whose anchor is absent skip the regex engine.
+_PII_REQUIRES = {
+    "[SSN_REDACTED]": "-",
+    "[EMAIL_REDACTED]": "@",
+    "[PHONE_REDACTED]": "-",
+}
+
+
+@lru_cache(maxsize=None)
+def _pii_regex(enabled: Tuple[int, ...]) -> "re.Pattern[str]":
+    """
+    The enabled PII patterns folded into one alternation; the named group that
+    matched selects the replacement. Matching is leftmost-first: the match that
+    starts earliest in the text wins, and PII_PATTERNS order only breaks ties
+    at the same start. Unlike sequential subs, an SSN inside an email address
+    is therefore redacted as part of the email.
+    """
+    return re.compile(
+        "|".join(f"(?P<pii{i}>{PII_PATTERNS[i][0].pattern})" for i in enabled)
+    )
 
 
 def contains_deny_terms(text: str) -> bool:
     """Return True if text contains any deny-listed terms (word-boundary, case-insensitive)."""
-    return any(p.search(text) for p in _DENY_PATTERNS)
+    if _DENY_PREFILTER and text.isascii():
+        lowered = text.lower()
+        if not any(term in lowered for term in _DENY_LITERALS):
+            return False
+    return _DENY_REGEX.search(text) is not None
 
 
 def enforce_size_limit(text: str) -> None:
@@ -38,9 +84,41 @@ def enforce_size_limit(text: str) -> None:
         raise ValueError(f"Input too long ({len(text)} chars). Limit is {MAX_CHARS:,}.")
 
 
+def enforce_size_limit_bytes(raw: bytes, max_chars: int = MAX_CHARS) -> None:
+    """
+    Raise ValueError if a raw JSON body is too large to hold max_chars of text.
+    Runs before decoding so oversized requests are refused without parsing;
+    the str-based enforce_size_limit still applies to the decoded text.
+    """
+    limit = max_chars * MAX_JSON_BYTES_PER_CHAR + JSON_ENVELOPE_BYTES
+    if len(raw) > limit:
+        raise ValueError(
+            f"Input too long ({len(raw):,} bytes). Limit is {max_chars:,} chars."
+        )
+
+
+def _pii_replacement(match: "re.Match[str]") -> str:
+    # Group names are "pii<index into PII_PATTERNS>"
+    return PII_PATTERNS[int(match.lastgroup[3:])][1]
+
+
 def scrub_pii(text: str) -> str:
-    """Naively scrub personally identifiable info using regex patterns."""
-    scrubbed = text
-    for pattern, replacement in PII_PATTERNS:
-        scrubbed = pattern.sub(replacement, scrubbed)
-    return scrubbed
+    """Naively scrub personally identifiable info using regex patterns (single pass)."""
+    enabled = tuple(
+        i
+        for i, (_, repl) in enumerate(PII_PATTERNS)
+        if _PII_REQUIRES.get(repl, "") in text
+    )
+    return _pii_regex(enabled).sub(_pii_replacement, text)
+
+
+def filter_pipeline(text: str) -> str:
+    """
+    Run every ingest guardrail in one call: size limit, deny terms, PII scrub.
+    Raises ValueError on oversized or unsafe input; returns the scrubbed text
+    (the original object when nothing needed redacting).
+    """
+    enforce_size_limit(text)
+    if contains_deny_terms(text):
+        raise ValueError("Input contains unsafe terms.")
+    return scrub_pii(text)
@@ -1,45 +1,129 @@
 # backend/memory_handler.py
 from __future__ import annotations
 
-import json
-from json import JSONDecodeError
-from pathlib import Path
-from typing import Any, Dict, Optional
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
 _CACHE_DIR = Path(".cache")
 _CACHE_DIR.mkdir(exist_ok=True)
 
+# Session directories already created by this process; skips the mkdir stat
+_KNOWN_DIRS: Set[Path] = set()
+
+
+# ASCII names (the common case) are sanitized by one C-level translate
+_ASCII_SAFE = str.maketrans(
+    {c: (chr(c) if chr(c).isalnum() or chr(c) in "-_" else "_") for c in range(128)}
+)
+
+
+@lru_cache(maxsize=4096)
+def _sanitize(name: str) -> str:
+    """Map a key or session id to a filesystem-safe name (memoized)."""
+    if name.isascii():
+        return name.translate(_ASCII_SAFE)
+    # Unicode letters and digits are kept, as str.isalnum allows them
+    return "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in name)
+
+
+def _ensure_dir(directory: Path) -> None:
+    if directory not in _KNOWN_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(directory)
+
 
 def _key_to_path(key: str, session_id: Optional[str] = None) -> Path:
     """Sanitize key into a safe filename, optionally namespaced by session."""
-    safe_key = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in key)
+    safe_key = _sanitize(key)
     if session_id:
-        safe_session = "".join(
-            ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in session_id
-        )
-        ns_dir = _CACHE_DIR / safe_session
-        ns_dir.mkdir(parents=True, exist_ok=True)
+        ns_dir = _CACHE_DIR / _sanitize(session_id)
+        _ensure_dir(ns_dir)
         return ns_dir / f"{safe_key}.json"
     return _CACHE_DIR / f"{safe_key}.json"
 
 
+# Raw bytes of recently read/written recaps, keyed by path and validated
+# against the file's (mtime_ns, size) so rewrites from any process invalidate
+# them. A hit skips open/read/close; every load still parses into a fresh dict.
+READ_CACHE_MAX = 256
+_READ_CACHE: "OrderedDict[Path, Tuple[int, int, bytes]]" = OrderedDict()
+_READ_CACHE_LOCK = threading.Lock()
+
+
+def _read_cache_get(path: Path, st: os.stat_result) -> Optional[bytes]:
+    with _READ_CACHE_LOCK:
+        entry = _READ_CACHE.get(path)
+        if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+            return None
+        _READ_CACHE.move_to_end(path)
+        return entry[2]
+
+
+def _read_cache_put(path: Path, st: os.stat_result, data: bytes) -> None:
+    with _READ_CACHE_LOCK:
+        _READ_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+        _READ_CACHE.move_to_end(path)
+        while len(_READ_CACHE) > READ_CACHE_MAX:
+            _READ_CACHE.popitem(last=False)
+
+
+def _unchanged_on_disk(path: Path, data: bytes) -> bool:
+    """True if path still holds exactly the bytes we last read or wrote."""
+    try:
+        return _read_cache_get(path, path.stat()) == data
+    except FileNotFoundError:
+        return False
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write to a per-writer temp file and os.replace it over path, so readers
+    never see a partially written recap.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def store_recap(
     key: str, recap: Dict[str, Any], session_id: Optional[str] = None
-) -> None:
+) -> bool:
     """
     Persist a recap dict to disk under a given key.
-    Raises IOError if write fails.
+    Returns True once written; raises IOError if write fails.
     """
     path = _key_to_path(key, session_id)
+    # Compact UTF-8 in one write; str() non-string keys as json.dump did
+    data = orjson.dumps(recap, option=orjson.OPT_NON_STR_KEYS)
+    if _unchanged_on_disk(path, data):
+        return True
     try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(recap, f, ensure_ascii=False, indent=2)
+        try:
+            _write_atomic(path, data)
+        except FileNotFoundError:
+            # Session directory removed since it was first created
+            _KNOWN_DIRS.discard(path.parent)
+            _ensure_dir(path.parent)
+            _write_atomic(path, data)
+        _read_cache_put(path, path.stat(), data)
     except IOError as e:
         logger.error(f"Failed to store recap at {path}: {e}")
         raise
+    return True
 
 
 def load_cached_recap(key: str, session_id: Optional[str] = None) -> Dict[str, Any]:
@@ -49,15 +133,40 @@ def load_cached_recap(key: str, session_id: Optional[str] = None) -> Dict[str, A
     or ValueError if the data is not a dict.
     """
     path = _key_to_path(key, session_id)
-    if not path.exists():
-        raise FileNotFoundError(f"No recap found at {path}")
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No recap found at {path}") from None
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
+        cached = _read_cache_get(path, st)
+        data = path.read_bytes() if cached is None else cached
+        raw = orjson.loads(data)
         if not isinstance(raw, dict):
             raise ValueError(f"Invalid recap format at {path}")
-        return {str(k): v for k, v in raw.items()}
-    except (IOError, JSONDecodeError) as e:
+        if cached is None:
+            _read_cache_put(path, st, data)
+        return raw
+    except (IOError, orjson.JSONDecodeError) as e:
         logger.error(f"Failed to load recap at {path}: {e}")
         raise
+
+
+def purge_stale_recaps(prefix: str, max_age: float) -> int:
+    """
+    Delete cached recaps whose key starts with prefix and whose file is older
+    than max_age seconds, in every session namespace. Returns the count removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in _CACHE_DIR.glob(f"**/{_sanitize(prefix)}*.json"):
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        with _READ_CACHE_LOCK:
+            _READ_CACHE.pop(path, None)
+        removed += 1
+    return removed
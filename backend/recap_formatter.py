@@ -1,6 +1,9 @@
 # backend/recap_formatter.py
 from backend.schema import Recap
 
+# Recap's compiled serializer, bound once; model_dump() wraps this same call
+_dump_recap = Recap.__pydantic_serializer__.to_python
+
 
 def format_recap(data: Recap) -> dict:
     """Return dual output: human-readable string and raw JSON dict."""
@@ -23,4 +26,4 @@ def format_recap(data: Recap) -> dict:
 
     human.append(f"📌 What You Built: {data.summary}")
 
-    return {"human_readable": "\n".join(human), "raw_json": data.model_dump()}
+    return {"human_readable": "\n".join(human), "raw_json": _dump_recap(data)}
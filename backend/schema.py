@@ -29,3 +29,34 @@ class Recap(BaseModel):
     quality_flags: List[str] = Field(default_factory=list)
 
     model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+
+# The reasoning agent's raw analysis, used as its Strands structured-output
+# model so Bedrock tool use returns JSON directly. Deliberately lenient (untyped
+# items, unknown keys kept): the agent reshapes it into a Recap afterwards.
+# The docstring doubles as the tool description the model sees.
+class AgentAnalysis(BaseModel):
+    """
+    Structured insights extracted from a builder's chat transcript.
+    """
+
+    session_id: Optional[str] = None
+    aha_moments: List[Any] = Field(default_factory=list)
+    mvp_changes: List[Any] = Field(default_factory=list)
+    code_snippets: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Code blocks with content, language, user_marked_final, context, file",
+    )
+    design_tradeoffs: List[Any] = Field(default_factory=list)
+    scope_creep: List[Any] = Field(default_factory=list)
+    readme_notes: List[Any] = Field(default_factory=list)
+    post_mvp_ideas: List[Any] = Field(default_factory=list)
+    quality_flags: List[Any] = Field(
+        default_factory=list, description="Items with issue, severity, file"
+    )
+    quality_scores: List[Any] = Field(
+        default_factory=list, description="Items with component, score, rationale"
+    )
+    summary: str = ""
+
+    model_config = ConfigDict(extra="allow")
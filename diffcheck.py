@@ -3,13 +3,15 @@ Performs deduplication, versioning, and diffing of classified code blocks.
 Used by Ariadne Clew to generate structured recaps from chat logs.
 """
 
+import copy
 import difflib
-from typing import List, TypedDict
+from typing import Any, Callable, Dict, List, NotRequired, Optional, TypedDict
 
 
 class CodeBlock(TypedDict):
     type: str
     content: str
+    validation: NotRequired[Any]
 
 
 class EnrichedSnippet(TypedDict):
@@ -84,12 +86,17 @@ def add_versions(snippets: List[CodeBlock]) -> List[EnrichedSnippet]:
     return result
 
 
-def diff_code_blocks(blocks: List[CodeBlock]) -> RecapOutput:
+def diff_code_blocks(
+    blocks: List[CodeBlock], validator: Optional[Callable[[str], Any]] = None
+) -> RecapOutput:
     """
     Processes classified chat blocks and returns a structured recap.
 
     Args:
         blocks: List of classified blocks with 'type' and 'content'.
+        validator: Optional snippet validator; when given, its result is stored
+            on each code block under 'validation' during the same traversal.
+            Repeated snippets are validated once and get a copy of the result.
 
     Returns:
         RecapOutput: Dictionary containing:
@@ -100,8 +107,21 @@ def diff_code_blocks(blocks: List[CodeBlock]) -> RecapOutput:
     if not isinstance(blocks, list) or not all(isinstance(b, dict) for b in blocks):
         raise ValueError("blocks must be a list of dicts")
 
-    code_blocks = [b for b in blocks if b.get("type") == "code"]
-    text_blocks = [b for b in blocks if b.get("type") == "text"]
+    code_blocks: List[CodeBlock] = []
+    text_blocks: List[CodeBlock] = []
+    validated: Dict[str, Any] = {}
+    for b in blocks:
+        block_type = b.get("type")
+        if block_type == "code":
+            if validator is not None:
+                content = b.get("content", "")
+                if content in validated:
+                    b["validation"] = copy.copy(validated[content])
+                else:
+                    b["validation"] = validated[content] = validator(content)
+            code_blocks.append(b)
+        elif block_type == "text":
+            text_blocks.append(b)
 
     deduped = deduplicate_code_snippets(code_blocks)
     enriched = add_versions(deduped)
@@ -4,6 +4,7 @@ from backend.filters import (
     PII_PATTERNS,
     contains_deny_terms,
     enforce_size_limit,
+    filter_pipeline,
     scrub_pii,
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     "PII_PATTERNS",
     "contains_deny_terms",
     "enforce_size_limit",
+    "filter_pipeline",
     "scrub_pii",
 ]
@@ -11,6 +11,9 @@ logger.setLevel(logging.INFO)
 
 MAX_CHARS = 100_000  # ~20k tokens max
 
+# ``` with optional language label and optional newline; compiled once
+_FENCE_SPLIT = re.compile(r"```(?:[a-zA-Z]*)?\n?")
+
 
 def validate_input_length(text: str) -> None:
     """
@@ -50,7 +53,7 @@ def classify_blocks(chat_log: Union[str, List[str]]) -> List[Block]:
         raise ValueError(f"Unmatched code fence: found {fence_count} backticks.")
 
     # Regex split on ``` with optional language label and optional newline
-    blocks = re.split(r"```(?:[a-zA-Z]*)?\n?", chat_log)
+    blocks = _FENCE_SPLIT.split(chat_log)
 
     result = []
     for idx, block in enumerate(blocks):
@@ -0,0 +1,265 @@
+"""
+Unit tests for the response-parsing and formatting helpers in backend.agent.
+These run without calling Bedrock; the Strands agent is stubbed where needed.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+import orjson
+import pytest
+
+from backend import agent as agent_module
+from backend.agent import (
+    AriadneClew,
+    invoke,
+    _extract_json_from_text,
+    _generate_human_summary_html,
+    _looks_like_agent_wrapper,
+    _parse_agent_result,
+)
+from backend.schema import AgentAnalysis
+
+
+@pytest.fixture(autouse=True)
+def clear_analysis_cache():
+    """Keep cached analyses from leaking between tests."""
+    agent_module._ANALYSIS_CACHE.clear()
+    yield
+    agent_module._ANALYSIS_CACHE.clear()
+
+
+def test_extracts_json_from_fenced_block():
+    text = 'Here you go:\n```json\n{"summary": "ok"}\n```\nThanks!'
+    assert _extract_json_from_text(text) == {"summary": "ok"}
+
+
+def test_fence_tag_is_case_insensitive_and_skips_other_fences():
+    text = '```python\nprint(1)\n```\n```JSON\n{"aha_moments": ["x"]}\n```'
+    assert _extract_json_from_text(text) == {"aha_moments": ["x"]}
+
+
+def test_raw_json_without_fence():
+    assert _extract_json_from_text('  {"summary": "raw"}  ') == {"summary": "raw"}
+
+
+def test_falls_back_to_outermost_brace_span():
+    text = 'Sure! Here is the recap: {"summary": "prose"} Hope that helps.'
+    assert _extract_json_from_text(text) == {"summary": "prose"}
+    assert _extract_json_from_text('```\n{"summary": "bare"}\n```') == {
+        "summary": "bare"
+    }
+    assert _extract_json_from_text('```json\n{"open": true}') == {"open": True}
+
+
+def test_unparseable_text_returns_none():
+    assert _extract_json_from_text("no json here") is None
+    assert _extract_json_from_text('```json\n{"open": ') is None
+    assert _extract_json_from_text(None) is None
+
+
+def test_html_summary_sections_in_order_and_escaped():
+    analysis = {
+        "session_id": "s-1",
+        "summary": "Built <parser>",
+        "aha_moments": ["a & b"],
+        "mvp_changes": [],
+        "design_tradeoffs": ["speed"],
+        "code_snippets": [{"content": "x = 1", "language": "python"}],
+        "post_mvp_ideas": ["later"],
+    }
+    html_text = _generate_human_summary_html(analysis)
+
+    assert html_text == (
+        "<h2>Session: s-1</h2>"
+        "<h3>Summary</h3><p>Built &lt;parser&gt;</p>"
+        "<h3>Key Insights</h3><ul><li>a &amp; b</li></ul>"
+        "<h3>Design Tradeoffs</h3><ul><li>speed</li></ul>"
+        "<h3>Code Discovered</h3>"
+        "<ul><li><strong>[python]</strong> <code>x = 1</code></li></ul>"
+        "<h3>Post-MVP Ideas</h3><ul><li>later</li></ul>"
+    )
+
+
+def test_format_for_demo_keeps_analysis_when_recap_rejects_it():
+    analysis = {
+        "session_id": "s-2",
+        "summary": "ok",
+        "aha_moments": ["a"],
+        "code_snippets": [{"language": "python", "content": "x = 1"}],
+    }
+    clew = AriadneClew(session_id="s-2")
+
+    out = clew._format_for_demo(analysis)
+
+    assert out["structured_data"] == analysis
+    assert out["agent_metadata"]["code_snippets_found"] == 1
+
+
+def test_agent_wrapper_detection():
+    assert _looks_like_agent_wrapper({"role": "assistant", "content": [{"text": "{}"}]})
+    assert not _looks_like_agent_wrapper({"content": [{"text": "{}"}]})
+    assert not _looks_like_agent_wrapper({"role": "assistant", "content": []})
+    assert not _looks_like_agent_wrapper("role content")
+    assert not _looks_like_agent_wrapper(None)
+
+
+def test_identical_concurrent_transcripts_share_one_agent_call(monkeypatch):
+    calls = []
+    joined = threading.Semaphore(0)
+
+    class CountingFuture(Future):
+        def result(self, timeout=None):
+            joined.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(agent_module, "Future", CountingFuture)
+
+    def gated_agent(prompt):
+        calls.append(prompt)
+        # Hold the call open until both other transcripts are waiting on it
+        for _ in range(2):
+            assert joined.acquire(timeout=5), "duplicate call never joined"
+        return Mock(message=json.dumps({"summary": "ok"}))
+
+    clew = AriadneClew(session_id="dedup")
+    clew.agent = gated_agent
+
+    async def run():
+        return await asyncio.gather(
+            *(clew.process_transcript("same log") for _ in range(3))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [r["structured_data"]["summary"] for r in results] == ["ok"] * 3
+
+
+def test_parse_agent_result_dict_paths():
+    analysis = {"summary": "direct"}
+    assert _parse_agent_result(analysis) is analysis
+
+    wrapper = {"role": "assistant", "content": [{"text": '{"summary": "wrapped"}'}]}
+    assert _parse_agent_result(wrapper) == {"summary": "wrapped"}
+
+    message = Mock(content=None, message='```json\n{"summary": "msg"}\n```')
+    assert _parse_agent_result(message) == {"summary": "msg"}
+
+
+def test_repeated_transcript_is_served_from_analysis_cache():
+    stub = Mock(return_value=Mock(message=json.dumps({"summary": "cached"})))
+
+    first = AriadneClew(session_id="a")
+    first.agent = stub
+    second = AriadneClew(session_id="b")
+    second.agent = stub
+
+    r1 = first.process_transcript_sync("same transcript")
+    r2 = second.process_transcript_sync("same transcript")
+
+    assert stub.call_count == 1
+    assert r1["structured_data"]["summary"] == r2["structured_data"]["summary"]
+    assert (r1["session_id"], r2["session_id"]) == ("a", "b")
+    assert "Session: b" in r2["human_readable"]
+
+
+def test_invoke_batches_chat_logs_with_per_item_status(monkeypatch):
+    stub = Mock(side_effect=lambda p: Mock(message=json.dumps({"summary": p[-3:]})))
+    monkeypatch.setattr(agent_module, "agent", stub)
+
+    out = asyncio.run(invoke({"chat_logs": ["one", "two", ""], "session_id": "s"}))
+
+    assert out["status"] == "success"
+    ok1, ok2, bad = out["results"]
+    assert ok1["result"]["session_id"] == "s-0"
+    assert ok2["result"]["structured_data"]["summary"] == "two"
+    assert bad == {"status": "failed", "error": "Missing chat content."}
+    assert stub.call_count == 2
+
+
+def test_invoke_rejects_oversized_batch(monkeypatch):
+    stub = Mock()
+    monkeypatch.setattr(agent_module, "agent", stub)
+    monkeypatch.setattr(agent_module, "MAX_BATCH", 2)
+
+    out = asyncio.run(invoke({"chat_logs": ["a", "b", "c"]}))
+
+    assert out["status"] == "failed"
+    assert "limit is 2" in out["error"]
+    stub.assert_not_called()
+
+
+def test_invoke_single_chat_log(monkeypatch):
+    stub = Mock(return_value=Mock(message=json.dumps({"summary": "single"})))
+    monkeypatch.setattr(agent_module, "agent", stub)
+
+    out = asyncio.run(invoke({"chat_log": "x", "session_id": "one"}))
+
+    assert out["status"] == "success"
+    assert out["result"]["session_id"] == "one"
+    assert out["result"]["structured_data"]["summary"] == "single"
+    assert asyncio.run(invoke({"session_id": "one"})) == {
+        "error": "Missing chat content.",
+        "status": "failed",
+    }
+
+
+def test_invoke_error_message_is_bounded(monkeypatch):
+    stub = Mock(side_effect=RuntimeError("x" * 10_000))
+    monkeypatch.setattr(agent_module, "agent", stub)
+
+    out = asyncio.run(invoke({"chat_log": "boom", "session_id": "err"}))
+
+    assert out["status"] == "failed"
+    assert out["error"].startswith("AgentCore entrypoint failed: xxx")
+    assert len(out["error"]) < 600
+
+
+def test_parse_agent_result_prefers_structured_output():
+    result = Mock(
+        structured_output=AgentAnalysis(summary="typed", aha_moments=["a"]),
+        message="not json",
+    )
+    parsed = _parse_agent_result(result)
+    assert parsed["summary"] == "typed"
+    assert parsed["aha_moments"] == ["a"]
+
+
+def test_structured_output_failure_falls_back_to_text_reply():
+    from strands.types.exceptions import StructuredOutputException
+
+    class TextOnlyAgent:
+        messages = [
+            {"role": "user", "content": [{"text": "log"}]},
+            {"role": "assistant", "content": [{"text": '{"summary": "text"}'}]},
+        ]
+
+        def __call__(self, prompt):
+            raise StructuredOutputException("tool not invoked")
+
+    clew = AriadneClew(session_id="fallback")
+    clew.agent = TextOnlyAgent()
+
+    recap = clew.process_transcript_sync("log")
+
+    assert recap["structured_data"]["summary"] == "text"
+
+
+def test_structured_output_failure_without_json_reply_raises():
+    from strands.types.exceptions import StructuredOutputException
+
+    class ProseAgent:
+        messages = [{"role": "assistant", "content": [{"text": "no json here"}]}]
+
+        def __call__(self, prompt):
+            raise StructuredOutputException("tool not invoked")
+
+    clew = AriadneClew(session_id="fallback")
+    clew.agent = ProseAgent()
+
+    with pytest.raises(StructuredOutputException):
+        clew.process_transcript_sync("log")
@@ -16,8 +16,11 @@ def client():
 @pytest.fixture(autouse=True)
 def mock_prompts(monkeypatch, request):
     """Mock load_prompts to avoid file system dependencies during testing."""
-    # Skip mocking for the specific test that wants to test file errors
-    if request.node.name == "test_missing_prompt_file_throws":
+    # Skip mocking for the tests that exercise the real prompt loader
+    if request.node.name in (
+        "test_missing_prompt_file_throws",
+        "test_load_prompts_reads_files_once",
+    ):
         return
     monkeypatch.setattr(
         "api_recap.load_prompts", lambda: "Mock system prompt\n\nMock classifier prompt"
@@ -88,7 +91,7 @@ def test_wrong_content_type(client, mock_store, mock_bedrock_simple):
 def test_oversized_input(client, mock_store, mock_bedrock_simple):
     """Test handling of oversized input."""
     with mock_store, mock_bedrock_simple, patch(
-        "api_recap.enforce_size_limit", side_effect=ValueError("Too large")
+        "api_recap.filter_pipeline", side_effect=ValueError("Too large")
     ):
         response = client.post("/v1/recap", json={"chat_log": "x" * 200000})
         assert response.status_code == 400
@@ -98,7 +101,8 @@ def test_oversized_input(client, mock_store, mock_bedrock_simple):
 def test_input_with_deny_terms(client, mock_store, mock_bedrock_simple):
     """Test handling of input with deny terms."""
     with mock_store, mock_bedrock_simple, patch(
-        "api_recap.contains_deny_terms", return_value=True
+        "api_recap.filter_pipeline",
+        side_effect=ValueError("Input contains unsafe terms."),
     ):
         response = client.post("/v1/recap", json={"chat_log": "contains password"})
         assert response.status_code == 400
@@ -108,7 +112,7 @@ def test_input_with_deny_terms(client, mock_store, mock_bedrock_simple):
 def test_pii_stripping(client, mock_store, mock_bedrock_simple):
     """Test PII scrubbing functionality."""
     with mock_store, mock_bedrock_simple, patch(
-        "api_recap.scrub_pii", return_value="Cleaned chat"
+        "api_recap.filter_pipeline", return_value="Cleaned chat"
     ) as mock_scrub, patch(
         "api_recap.diff_code_blocks",
         return_value={
@@ -189,6 +193,7 @@ def test_missing_prompt_file_throws():
     ):
         from api_recap import load_prompts
 
+        load_prompts.cache_clear()
         with pytest.raises(RuntimeError):
             load_prompts()
 
@@ -199,3 +204,134 @@ def test_bedrock_failure_returns_500(client):
         response = client.post("/v1/recap", json={"chat_log": "```print('oops')```"})
         assert response.status_code == 500
         assert "error" in response.get_json()
+
+
+def test_unexpected_bedrock_format_raises():
+    """A response without content is a classifier failure, not a text block."""
+    import io
+    import api_recap
+
+    api_recap._CLASSIFY_CACHE.clear()
+    with patch(
+        "api_recap.bedrock.invoke_model",
+        return_value={"body": io.BytesIO(b'{"unexpected": true}')},
+    ):
+        with pytest.raises(RuntimeError, match="Bedrock classification failed"):
+            api_recap.classify_with_bedrock("odd response prompt")
+    assert not api_recap._CLASSIFY_CACHE
+
+
+def test_missing_bedrock_client_raises(monkeypatch):
+    """Without a client the classifier fails instead of echoing the prompt."""
+    import api_recap
+
+    monkeypatch.setattr(api_recap, "bedrock", None)
+    with pytest.raises(RuntimeError, match="unavailable"):
+        api_recap.classify_with_bedrock("no client prompt")
+
+
+def test_load_prompts_reads_files_once():
+    """Prompt files are read on the first call only; later calls hit the cache."""
+    from api_recap import load_prompts
+
+    load_prompts.cache_clear()
+    with patch("api_recap.Path.read_text", return_value="prompt") as mock_read:
+        first = load_prompts()
+        second = load_prompts()
+    load_prompts.cache_clear()
+
+    assert first == second
+    assert mock_read.call_count == 2  # system + classifier, once each
+
+
+def test_classify_with_bedrock_caches_by_prompt():
+    """Identical prompts reuse the cached classification instead of calling Bedrock."""
+    import io
+    import json as _json
+    import api_recap
+
+    api_recap._CLASSIFY_CACHE.clear()
+    body = _json.dumps({"content": [{"text": "intro```print('x')```"}]}).encode()
+    with patch(
+        "api_recap.bedrock.invoke_model",
+        side_effect=lambda **_: {"body": io.BytesIO(body)},
+    ) as mock_invoke:
+        first = api_recap.classify_with_bedrock("same prompt")
+        first[1]["validation"] = {"status": "valid"}  # callers mutate blocks
+        second = api_recap.classify_with_bedrock("same prompt")
+    api_recap._CLASSIFY_CACHE.clear()
+
+    assert mock_invoke.call_count == 1
+    assert "validation" not in second[1]
+    assert second[1]["content"] == "print('x')"
+
+
+def test_classify_with_bedrock_dedupes_inflight_calls():
+    """Concurrent identical prompts share a single Bedrock call."""
+    import io
+    import json as _json
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import api_recap
+
+    api_recap._CLASSIFY_CACHE.clear()
+    body = _json.dumps({"content": [{"text": "only text"}]}).encode()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow_invoke(**_):
+        entered.set()
+        release.wait(timeout=5)
+        return {"body": io.BytesIO(body)}
+
+    with patch(
+        "api_recap.bedrock.invoke_model", side_effect=slow_invoke
+    ) as mock_invoke:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(api_recap.classify_with_bedrock, "burst prompt")
+                for _ in range(4)
+            ]
+            assert entered.wait(timeout=5), "Bedrock call never started"
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+    api_recap._CLASSIFY_CACHE.clear()
+
+    assert mock_invoke.call_count == 1
+    assert all(r == [{"type": "text", "content": "only text"}] for r in results)
+
+
+def test_non_object_body_is_rejected(client):
+    """A JSON body that is not an object fails request validation with 400."""
+    response = client.post("/v1/recap", json=["not", "an", "object"])
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_malformed_json_returns_400(client):
+    """Bodies that are not valid JSON are rejected before the pipeline runs."""
+    response = client.post(
+        "/v1/recap", data="{not json", content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_repeat_post_reprocesses_request(client):
+    """Identical bodies are processed (and persisted) again; POST never answers 304."""
+    recap = ({"human_readable": "cached", "raw_json": {}}, 200)
+    with patch("api_recap.process_recap_request", return_value=recap) as mock_process:
+        first = client.post("/v1/recap", json={"chat_log": "same log"})
+        second = client.post("/v1/recap", json={"chat_log": "same log"})
+        revalidated = client.post(
+            "/v1/recap",
+            json={"chat_log": "same log"},
+            headers={"If-None-Match": "*"},
+        )
+
+    assert mock_process.call_count == 3
+    assert first.status_code == second.status_code == 200
+    assert second.get_json() == {"human_readable": "cached", "raw_json": {}}
+    assert revalidated.status_code == 200
+    assert revalidated.get_json() == second.get_json()
+    assert "ETag" not in first.headers
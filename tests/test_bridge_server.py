@@ -0,0 +1,76 @@
+"""
+Result-cache behaviour of the bridge's /v1/recap route.
+AgentCore is stubbed through the in-process runtime path.
+"""
+
+import pytest
+
+import bridge_server
+from backend import memory_handler
+
+SESSION = "s" * 33
+
+
+@pytest.fixture
+def runtime(monkeypatch, tmp_path):
+    """Route get_recap through a stubbed runtime and an isolated cache dir."""
+    monkeypatch.setattr(memory_handler, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(bridge_server, "_RUNTIME_CLIENT", object())
+    replies = []
+    calls = []
+
+    def fake_invoke(chat_log, session_id):
+        calls.append(chat_log)
+        return replies.pop(0)
+
+    monkeypatch.setattr(bridge_server, "_invoke_runtime", fake_invoke)
+    return replies, calls
+
+
+def _post(chat_log, session_id=SESSION):
+    client = bridge_server.app.test_client()
+    return client.post(
+        "/v1/recap", json={"chat_log": chat_log, "session_id": session_id}
+    )
+
+
+def test_failed_analysis_is_an_error_and_not_cached(runtime):
+    replies, calls = runtime
+    replies.append({"status": "failed", "error": "model exploded"})
+    replies.append({"status": "success", "result": {"structured_data": {"a": 1}}})
+
+    first = _post("User: hi")
+    assert first.status_code == 502
+    assert first.get_json()["status"] == "error"
+
+    second = _post("User: hi")
+    assert second.status_code == 200
+    assert second.get_json()["raw_json"] == {"a": 1}
+    assert len(calls) == 2
+
+
+def test_successful_analysis_is_replayed_until_it_expires(runtime, monkeypatch):
+    replies, calls = runtime
+    ok = {"status": "success", "result": {"structured_data": {"a": 1}}}
+    replies.extend([ok, ok])
+
+    assert _post("User: again").status_code == 200
+    assert _post("User: again").get_json()["raw_json"] == {"a": 1}
+    assert len(calls) == 1
+
+    monkeypatch.setattr(bridge_server, "RESULT_CACHE_TTL", -1)
+    assert _post("User: again").status_code == 200
+    assert len(calls) == 2
+
+
+def test_cached_result_is_not_shared_across_sessions(runtime):
+    replies, calls = runtime
+    replies.append({"status": "success", "result": {"structured_data": {"a": 1}}})
+    replies.append({"status": "success", "result": {"structured_data": {"b": 2}}})
+
+    assert _post("User: shared").get_json()["raw_json"] == {"a": 1}
+    other = _post("User: shared", session_id="t" * 33).get_json()
+
+    assert other["raw_json"] == {"b": 2}
+    assert other["session_id"] == "t" * 33
+    assert len(calls) == 2
@@ -23,3 +23,49 @@ def test_diff_code_blocks_propagates_metadata():
     for rv in recap.rejected_versions:
         assert "reason" in rv.validation
         assert rv.validation["status"] in ("invalid", "unknown")
+
+
+def test_root_diff_code_blocks_validates_inline():
+    """The root diffcheck runs the validator on code blocks during its single pass."""
+    from diffcheck import diff_code_blocks as diff_with_validation
+
+    calls = []
+
+    def validator(code):
+        calls.append(code)
+        return {"status": "valid"}
+
+    blocks = [
+        {"type": "text", "content": "intro"},
+        {"type": "code", "content": "x = 1"},
+        {"type": "code", "content": "x = 2"},
+    ]
+    recap = diff_with_validation(blocks, validator=validator)
+
+    assert calls == ["x = 1", "x = 2"]
+    assert blocks[1]["validation"] == {"status": "valid"}
+    assert "validation" not in blocks[0]
+    assert recap["final"]["content"] == "x = 2"
+    assert recap["text_summary"] == "intro"
+
+
+def test_root_diff_code_blocks_validates_repeated_snippets_once():
+    """Identical code blocks share one validator call but not one result object."""
+    from diffcheck import diff_code_blocks as diff_with_validation
+
+    calls = []
+
+    def validator(code):
+        calls.append(code)
+        return {"status": "valid"}
+
+    blocks = [
+        {"type": "code", "content": "x = 1"},
+        {"type": "code", "content": "x = 1"},
+        {"type": "code", "content": "x = 2"},
+    ]
+    diff_with_validation(blocks, validator=validator)
+
+    assert calls == ["x = 1", "x = 2"]
+    assert blocks[1]["validation"] == blocks[0]["validation"]
+    assert blocks[1]["validation"] is not blocks[0]["validation"]
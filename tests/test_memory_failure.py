@@ -18,3 +18,15 @@ def test_persistence_failure_raises(monkeypatch):
 
     with pytest.raises(RuntimeError, match="Unable to persist recap"):
         create_recap_from_log("dummy log", "fail-session")
+
+
+def test_background_persistence_failure_is_not_raised(monkeypatch):
+    """With strict_persist=False the recap is returned and storage runs async."""
+    monkeypatch.setattr(
+        "api_recap.classify_with_bedrock",
+        lambda prompt: [{"type": "text", "content": "notes only"}],
+    )
+    monkeypatch.setattr("api_recap.store_recap", lambda *a, **kw: False)
+
+    recap = create_recap_from_log("dummy log", "fail-session", strict_persist=False)
+    assert "human_readable" in recap
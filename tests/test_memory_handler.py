@@ -1,5 +1,7 @@
-import pytest
 import json
+import os
+
+import pytest
 from backend import memory_handler as mh
 
 
@@ -44,3 +46,50 @@ def test_key_sanitization_and_unicode(tmp_path, monkeypatch):
     assert path.exists()
     loaded = mh.load_cached_recap(key)
     assert loaded == recap
+
+
+def test_store_recreates_removed_session_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(mh, "_CACHE_DIR", tmp_path)
+    mh.store_recap("k", {"n": 1}, session_id="sess")
+    (tmp_path / "sess" / "k.json").unlink()
+    (tmp_path / "sess").rmdir()
+
+    mh.store_recap("k", {"n": 2}, session_id="sess")
+    assert mh.load_cached_recap("k", session_id="sess") == {"n": 2}
+
+
+def test_load_sees_external_rewrites_and_returns_fresh_dicts(tmp_path, monkeypatch):
+    monkeypatch.setattr(mh, "_CACHE_DIR", tmp_path)
+    mh.store_recap("k", {"summary": "first"})
+
+    loaded = mh.load_cached_recap("k")
+    loaded["summary"] = "mutated"
+    assert mh.load_cached_recap("k") == {"summary": "first"}
+
+    mh._key_to_path("k").write_text('{"summary": "rewritten"}', encoding="utf-8")
+    assert mh.load_cached_recap("k") == {"summary": "rewritten"}
+
+
+def test_store_is_atomic_and_skips_identical_rewrites(tmp_path, monkeypatch):
+    monkeypatch.setattr(mh, "_CACHE_DIR", tmp_path)
+    mh.store_recap("k", {"summary": "same"})
+    path = mh._key_to_path("k")
+    first = path.stat().st_mtime_ns
+
+    assert mh.store_recap("k", {"summary": "same"}) is True
+    assert path.stat().st_mtime_ns == first
+    assert [p.name for p in tmp_path.iterdir()] == ["k.json"]
+
+
+def test_purge_stale_recaps_removes_only_old_prefixed_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(mh, "_CACHE_DIR", tmp_path)
+    mh.store_recap("bridge-old", {"n": 1}, session_id="s1")
+    mh.store_recap("bridge-new", {"n": 2}, session_id="s2")
+    mh.store_recap("last_recap", {"n": 3}, session_id="s1")
+    old = mh._key_to_path("bridge-old", "s1")
+    os.utime(old, (0, 0))
+
+    assert mh.purge_stale_recaps("bridge-", max_age=60) == 1
+    assert not old.exists()
+    assert mh.load_cached_recap("bridge-new", session_id="s2") == {"n": 2}
+    assert mh.load_cached_recap("last_recap", session_id="s1") == {"n": 3}